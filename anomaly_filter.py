@@ -0,0 +1,194 @@
+# anomaly_filter.py
+# Cheap streaming pre-filter that runs ahead of the severity model.
+#
+# Each sensor keeps an EWMA mean/variance per reading channel. A reading is
+# routed to full inference only if it looks interesting: a large incremental
+# z-score, a CUSUM change point (slow drift), or the warm-up period before a
+# baseline exists. Out-of-range values, and sensors whose channels are all
+# frozen for a long run of readings, are flagged as faults; they are still
+# scored (an extreme reading may be a real emergency) but never reuse a cached
+# severity. Everything else is steady state, and may reuse the severity of the
+# last reading scored for that sensor, but only if it is within a small
+# tolerance of that reading on every channel.
+#
+# Standard library only, so the dashboard can import it before pandas is loaded.
+import math
+import threading
+
+# Measuring range of common weather sensors (BME280/DHT22); anything outside
+# is flagged as a fault. Pass limits= to AnomalyFilter for other hardware.
+SENSOR_LIMITS = {
+    'temperature': (-60.0, 100.0),
+    'humidity': (0.0, 100.0),
+    'pressure': (300.0, 1100.0),
+}
+
+WARMUP = 'warmup'
+CHANGE = 'change'
+FAULT = 'fault'
+STEADY = 'steady'
+LABELS = [WARMUP, CHANGE, FAULT, STEADY]
+# Always scored by the model, and worth an alert if the result isn't Safe
+ROUTED = (WARMUP, CHANGE, FAULT)
+
+# How far a steady reading may be from the last scored one and still reuse its severity
+SCORE_TOLERANCE = {
+    'temperature': 0.5,
+    'humidity': 1.0,
+    'pressure': 0.5,
+}
+
+
+class _Channel:
+    __slots__ = ('count', 'mean', 'var', 'cusum_pos', 'cusum_neg', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.cusum_pos = 0.0
+        self.cusum_neg = 0.0
+        self.last = None
+
+
+class AnomalyFilter:
+    """Per-sensor EWMA / CUSUM change-point and fault detector.
+
+    check(row) returns one of 'warmup', 'change', 'fault' or 'steady'.
+    'warmup', 'change' and 'fault' always need the model (see should_route());
+    a 'steady' reading can skip it if cached_severity() returns a value.
+    Record every model result with remember(), and every severity shown for
+    a sensor with severity_changed().
+
+    A sensor is stuck once all of its channels have repeated their previous
+    value stuck_limit times in a row; a single channel at a coarse resolution
+    (integer humidity, say) repeating is normal.
+    """
+
+    def __init__(self, columns=tuple(SENSOR_LIMITS), alpha=0.1, z_threshold=3.0,
+                 cusum_drift=0.5, cusum_threshold=5.0, stuck_limit=30, warmup=10,
+                 limits=SENSOR_LIMITS, tolerance=SCORE_TOLERANCE):
+        self.columns = list(columns)
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.cusum_drift = cusum_drift
+        self.cusum_threshold = cusum_threshold
+        self.stuck_limit = stuck_limit
+        self.warmup = warmup
+        self.limits = limits
+        self.tolerance = tolerance
+        self._sensors = {}
+        self._frozen = {}
+        self._scored = {}
+        self._severity = {}
+        self._counts = dict.fromkeys(LABELS, 0)
+        self._model_calls = 0
+        self._reused = 0
+        self._lock = threading.Lock()
+
+    def _channel_label(self, ch, col, value):
+        ch.last = value
+        if value is None or math.isnan(value):
+            return FAULT
+        low, high = self.limits.get(col, (-math.inf, math.inf))
+        if not low <= value <= high:
+            return FAULT
+
+        label = WARMUP if ch.count < self.warmup else STEADY
+        if label == STEADY:
+            z = (value - ch.mean) / math.sqrt(ch.var) if ch.var > 0 else 0.0
+            ch.cusum_pos = max(0.0, ch.cusum_pos + z - self.cusum_drift)
+            ch.cusum_neg = max(0.0, ch.cusum_neg - z - self.cusum_drift)
+            if abs(z) > self.z_threshold or max(ch.cusum_pos, ch.cusum_neg) > self.cusum_threshold:
+                label = CHANGE
+                ch.cusum_pos = ch.cusum_neg = 0.0
+
+        # Update the baseline after scoring so a spike can't mask itself
+        if ch.count == 0:
+            ch.mean = value
+        else:
+            diff = value - ch.mean
+            ch.mean += self.alpha * diff
+            ch.var = (1 - self.alpha) * (ch.var + self.alpha * diff * diff)
+        ch.count += 1
+        return label
+
+    def check(self, row, sensor_id='default'):
+        """Classify one reading (dict-like) from sensor_id."""
+        with self._lock:
+            channels = self._sensors.setdefault(sensor_id, {col: _Channel() for col in self.columns})
+            values = {col: None if row.get(col) is None else float(row[col]) for col in self.columns}
+            frozen = all(values[col] is not None and values[col] == channels[col].last for col in self.columns)
+            self._frozen[sensor_id] = self._frozen.get(sensor_id, 0) + 1 if frozen else 0
+
+            labels = {self._channel_label(channels[col], col, values[col]) for col in self.columns}
+            if self._frozen[sensor_id] >= self.stuck_limit:
+                labels.add(FAULT)
+            # Most severe channel wins
+            for label in (FAULT, CHANGE, WARMUP, STEADY):
+                if label in labels:
+                    break
+            self._counts[label] += 1
+            return label
+
+    @staticmethod
+    def should_route(label):
+        return label in ROUTED
+
+    def cached_severity(self, row, sensor_id='default'):
+        """Severity of the last scored reading from sensor_id if row is close to it, else None."""
+        with self._lock:
+            scored = self._scored.get(sensor_id)
+            if scored is None:
+                return None
+            reading, severity = scored
+            for col in self.columns:
+                value = row.get(col)
+                if value is None or abs(float(value) - reading[col]) > self.tolerance.get(col, 0.0):
+                    return None
+            self._reused += 1
+            return severity
+
+    def remember(self, row, severity, sensor_id='default', reuse=True):
+        """Record a model result so nearby steady readings from sensor_id can reuse it.
+
+        Fault readings are recorded with reuse=False: counted, but not cached.
+        """
+        with self._lock:
+            if reuse:
+                self._scored[sensor_id] = ({col: float(row[col]) for col in self.columns}, severity)
+            self._model_calls += 1
+
+    def severity_changed(self, severity, sensor_id='default'):
+        """Record the severity shown for sensor_id; True if it differs from the previous one."""
+        with self._lock:
+            previous = self._severity.get(sensor_id)
+            self._severity[sensor_id] = severity
+            return severity != previous
+
+    def stats(self):
+        """Counters per label plus the fraction of traffic kept away from the model."""
+        with self._lock:
+            counts = dict(self._counts)
+            model_calls, reused = self._model_calls, self._reused
+        total = sum(counts.values())
+        # Reused severities, plus readings with a missing value (nothing to score)
+        skipped = total - model_calls
+        return {
+            **counts,
+            'total': total,
+            'routed': model_calls,
+            'reused': reused,
+            'short_circuited': skipped,
+            'short_circuit_ratio': skipped / total if total else 0.0,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._sensors.clear()
+            self._frozen.clear()
+            self._scored.clear()
+            self._severity.clear()
+            self._counts = dict.fromkeys(LABELS, 0)
+            self._model_calls = 0
+            self._reused = 0
@@ -0,0 +1,182 @@
+# backfill_predictions.py
+# Batch re-scoring of predicted_disaster for a sensor/prediction history CSV.
+#
+# The input is streamed in chunks, each chunk is scored in one vectorized
+# call on a process pool, and results are appended to a new file in input
+# order. Every column is carried through as text exactly as it was read;
+# only predicted_disaster is replaced, and rows with a missing reading are
+# left unscored (empty). Only a bounded number of chunks is ever in flight,
+# so memory stays flat regardless of input size. Progress is checkpointed
+# after every chunk; re-running the same command resumes where it stopped.
+#
+# Usage (from the repo root):
+#   python backfill_predictions.py data/prediction_log.csv
+#   python backfill_predictions.py data/real_sensor_data.csv -o data/real_sensor_data_scored.csv --workers 4
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import schema
+
+MODEL_FILE = "data/disaster_model.pkl"
+SCALER_FILE = "data/scaler.pkl"
+
+_model = None
+_scaler = None
+
+
+def load_model(model_file=MODEL_FILE, scaler_file=SCALER_FILE):
+    """Load the disaster classifier and scaler saved by train_model.py."""
+    global _model, _scaler
+    for path in (model_file, scaler_file):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found. Run train_model.py first.")
+    with open(model_file, "rb") as f:
+        _model = pickle.load(f)
+    with open(scaler_file, "rb") as f:
+        _scaler = pickle.load(f)
+
+
+def score_batch(features):
+    """Predict disaster labels for an (n, 3) array of temperature/humidity/pressure.
+
+    Rows with a missing reading are not sent to the model and get an empty label.
+    """
+    labels = np.full(len(features), "", dtype=object)
+    complete = ~np.isnan(features).any(axis=1)
+    if complete.any():
+        X = pd.DataFrame(features[complete], columns=schema.READING_COLUMNS)
+        labels[complete] = _model.predict(_scaler.transform(X))
+    return labels
+
+
+def reading_features(chunk):
+    """float32 (n, 3) reading array from a text chunk; unparsable or empty values are NaN."""
+    return np.column_stack([
+        pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=schema.READING_DTYPE)
+        for col in schema.READING_COLUMNS
+    ])
+
+
+def read_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_checkpoint(path, state):
+    # Write then rename so a crash never leaves a half-written checkpoint
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def backfill(input_file, output_file, checkpoint_file, chunksize=100_000, workers=None, model_file=MODEL_FILE,
+             scaler_file=SCALER_FILE):
+    """Score input_file into output_file, resuming from checkpoint_file if present.
+
+    Returns (rows scored in this run, elapsed seconds).
+    """
+    state = read_checkpoint(checkpoint_file)
+    if state and state.get("input") == os.path.abspath(input_file) and os.path.exists(output_file):
+        rows_done = state["rows_done"]
+        # Drop anything written after the last checkpoint
+        with open(output_file, "r+b") as f:
+            f.truncate(state["output_bytes"])
+        print(f"↩️  Resuming after {rows_done} rows")
+    else:
+        rows_done = 0
+        state = {"input": os.path.abspath(input_file), "rows_done": 0, "output_bytes": 0}
+        if os.path.dirname(output_file):
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        open(output_file, "w").close()
+
+    # Read every column as text so the output carries it through unchanged.
+    # A callable keeps skiprows O(1) in memory (a range would become a set).
+    chunks = pd.read_csv(input_file, dtype=str, keep_default_na=False, chunksize=chunksize,
+                         skiprows=lambda i: 0 < i <= rows_done)
+
+    if workers == 0:
+        load_model(model_file, scaler_file)
+        pool = None
+    else:
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=load_model, initargs=(model_file, scaler_file))
+    max_in_flight = 2 * (workers or 1)
+
+    pending = deque()
+    scored = 0
+    start = time.perf_counter()
+
+    def flush_one():
+        nonlocal scored
+        chunk, result = pending.popleft()
+        labels = result.result() if pool else result
+        chunk["predicted_disaster"] = labels
+        chunk.to_csv(output_file, mode="a", header=state["output_bytes"] == 0, index=False)
+        scored += len(chunk)
+        state["rows_done"] += len(chunk)
+        state["output_bytes"] = os.path.getsize(output_file)
+        write_checkpoint(checkpoint_file, state)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {state['rows_done']} rows  ({scored / elapsed:,.0f} rows/s)")
+
+    try:
+        for chunk in chunks:
+            features = reading_features(chunk)
+            if pool:
+                pending.append((chunk, pool.submit(score_batch, features)))
+            else:
+                pending.append((chunk, score_batch(features)))
+            while len(pending) >= max_in_flight:
+                flush_one()
+        while pending:
+            flush_one()
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    return scored, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score predicted_disaster for a history CSV")
+    parser.add_argument("input", help="History CSV (e.g. data/prediction_log.csv)")
+    parser.add_argument("--output", "-o", help="Output CSV (default: <input>_scored.csv)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.ckpt.json)")
+    parser.add_argument("--chunksize", "-c", type=int, default=100_000, help="Rows per batch (default 100000)")
+    parser.add_argument("--workers", "-w", type=int, default=None,
+                        help="Worker processes (default: CPU count, 0 = score in this process)")
+    parser.add_argument("--model", default=MODEL_FILE, help=f"Pickled classifier (default {MODEL_FILE})")
+    parser.add_argument("--scaler", default=SCALER_FILE, help=f"Pickled scaler (default {SCALER_FILE})")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ {args.input} not found.")
+        sys.exit(1)
+    output_file = args.output or os.path.splitext(args.input)[0] + "_scored.csv"
+    if os.path.abspath(output_file) == os.path.abspath(args.input):
+        print("❌ Output must be a different file than the input.")
+        sys.exit(1)
+    checkpoint_file = args.checkpoint or output_file + ".ckpt.json"
+
+    print(f"📥 Scoring: {args.input} -> {output_file}")
+    rows, elapsed = backfill(args.input, output_file, checkpoint_file, chunksize=max(1, args.chunksize),
+                             workers=args.workers, model_file=args.model, scaler_file=args.scaler)
+    rate = rows / elapsed if elapsed else 0.0
+    print(f"🟢 Backfill finished. {rows} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_schema_memory.py
+# Compare memory of a prediction-log history loaded with pandas defaults
+# (float64 + object strings) against the typed schema in schema.py.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_schema_memory.py                 # 10M synthetic rows
+#   python benchmarks/bench_schema_memory.py --rows 1000000
+#   python benchmarks/bench_schema_memory.py --csv data/prediction_log.csv
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import schema
+
+
+def synthetic_history(rows, seed=42):
+    """Frame shaped like pd.read_csv('prediction_log.csv') with default dtypes."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2025-09-15T00:00:00')
+    timestamps = start + np.arange(rows).astype('timedelta64[s]') * 2
+    return pd.DataFrame({
+        'temperature': rng.uniform(20, 40, rows).round(1),
+        'humidity': rng.uniform(40, 90, rows).round(1),
+        'pressure': rng.uniform(1005, 1020, rows).round(1),
+        'predicted_disaster': rng.choice(['flood', 'wildfire', 'landslide', 'no disaster'], rows).astype(object),
+        'timestamp': np.datetime_as_string(timestamps).astype(object),
+        'latitude': rng.uniform(-90, 90, rows).round(4),
+        'longitude': rng.uniform(-180, 180, rows).round(4),
+    })
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def report(label, df, elapsed=None):
+    line = f"{label:<8} {frame_mb(df):10.1f} MB"
+    if elapsed is not None:
+        line += f"  ({elapsed:.2f}s)"
+    print(line)
+    for col, dtype in df.dtypes.items():
+        print(f"    {col:<20} {str(dtype):<40} {df[col].memory_usage(deep=True) / 1024 ** 2:9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory saved by the typed sensor schema")
+    parser.add_argument("--rows", "-n", type=int, default=10_000_000, help="Synthetic rows (default 10M)")
+    parser.add_argument("--csv", help="Measure a real CSV instead of synthetic data")
+    args = parser.parse_args()
+
+    if args.csv:
+        t0 = time.perf_counter()
+        default = pd.read_csv(args.csv)
+        t_default = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        typed = schema.read_csv(args.csv)
+        t_typed = time.perf_counter() - t0
+    else:
+        print(f"Generating {args.rows:,} synthetic rows...")
+        default = synthetic_history(args.rows)
+        t_default = None
+        t0 = time.perf_counter()
+        typed = schema.apply_schema(default)
+        t_typed = time.perf_counter() - t0
+
+    report("default", default, t_default)
+    report("typed", typed, t_typed)
+    before, after = frame_mb(default), frame_mb(typed)
+    print(f"Reduction: {before:.1f} MB -> {after:.1f} MB ({100 * (1 - after / before):.1f}% smaller, "
+          f"{before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_startup.py
+# Import-time profile of dashboard.py (python -X importtime) plus the time
+# until the background warm-up has loaded the model. Runs twice: with the
+# checked-in data/sensor_snapshot.json, and cold (no snapshot, so the CSV is
+# parsed with pandas), e.g. after sensor_data.csv changed.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_startup.py                  # print report
+#   python benchmarks/bench_startup.py --save           # also update benchmarks/results/
+#   python benchmarks/bench_startup.py --module dash    # profile another import
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+READY_SCRIPT = """
+import time
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+done = getattr({module}, 'warmup_done', None)
+if done is not None:
+    done.wait()
+t2 = time.perf_counter()
+print(f"{{(t1 - t0) * 1000:.0f}} {{(t2 - t0) * 1000:.0f}}")
+"""
+
+
+def import_profile(module, env):
+    """Run `python -X importtime -c 'import module'` and parse the stderr table.
+
+    The dashboard warm-up thread is switched off here; its imports would
+    interleave with the main thread's and garble the nesting in the table.
+    """
+    env = dict(env, DASHBOARD_WARMUP="lazy")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def time_to_ready(module, env):
+    proc = subprocess.run([sys.executable, "-c", READY_SCRIPT.format(module=module)],
+                          cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    imported_ms, ready_ms = proc.stdout.split()[-2:]
+    return int(imported_ms), int(ready_ms)
+
+
+def profile_section(title, module, top, cold=False):
+    """Report lines for one start-up scenario.
+
+    cold=True points DASHBOARD_SNAPSHOT at a path that doesn't exist yet,
+    a fresh one for each subprocess, so both runs have to parse the CSV.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        def env(name):
+            if not cold:
+                return dict(os.environ)
+            return dict(os.environ, DASHBOARD_SNAPSHOT=os.path.join(tmp, name))
+
+        rows = import_profile(module, env("profile.json"))
+        try:
+            imported_ms, ready_ms = time_to_ready(module, env("ready.json"))
+            ready_line = f"wall time to import: {imported_ms} ms, to ready: {ready_ms} ms"
+        except (RuntimeError, ValueError) as e:
+            ready_line = f"time to ready: failed ({e})"
+
+    # Top-level imports (no leading spaces in the name column) add up to the total
+    total_us = sum(cum for cum, _, name in rows if not name.startswith("  "))
+    heavy = ("pandas", "numpy", "plotly.express", "sklearn", "joblib", "requests", "dotenv")
+    loaded = sorted({name.strip().split(".")[0] for _, _, name in rows})
+
+    lines = [
+        f"## {title}",
+        f"total import time: {total_us / 1000:.0f} ms",
+        ready_line,
+        "heavy modules imported eagerly: " +
+        (", ".join(m for m in heavy if m.split(".")[0] in loaded) or "none"),
+        "",
+        f"{'cumulative ms':>14} {'self ms':>9}  module",
+    ]
+    for cum, self_us, name in sorted(rows, reverse=True)[:top]:
+        lines.append(f"{cum / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+    return lines
+
+
+def build_report(module, top):
+    lines = [
+        f"# python -X importtime -c 'import {module}'",
+        f"# Python {platform.python_version()} on {platform.system()} {platform.machine()}",
+        "",
+    ]
+    lines += profile_section("with data/sensor_snapshot.json", module, top)
+    lines.append("")
+    lines += profile_section("cold start, no snapshot (CSV parsed with pandas)", module, top, cold=True)
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of the dashboard")
+    parser.add_argument("--module", "-m", default="dashboard", help="Module to import (default dashboard)")
+    parser.add_argument("--top", "-n", type=int, default=25, help="Rows to show (default 25)")
+    parser.add_argument("--save", action="store_true", help=f"Write the report to {RESULTS_DIR}")
+    args = parser.parse_args()
+
+    report = build_report(args.module, args.top)
+    print(report, end="")
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{args.module}_importtime.txt")
+        with open(path, "w") as f:
+            f.write(report)
+        print(f"✅ Saved to {os.path.relpath(path, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
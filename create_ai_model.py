@@ -4,10 +4,11 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
 import joblib
+import schema
 
 # Load sensor data
 try:
-    data = pd.read_csv("data/sensor_data.csv")
+    data = schema.read_csv("data/sensor_data.csv")
 except FileNotFoundError:
     print("sensor_data.csv not found. Make sure it's in the data/ folder.")
     exit()
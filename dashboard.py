@@ -1,47 +1,102 @@
 import os
 import random
 import threading
-import requests
-import pandas as pd
-import joblib
 from dash import Dash, dcc, html, Input, Output
-from dotenv import load_dotenv
-import plotly.express as px
+from anomaly_filter import AnomalyFilter, FAULT
+import snapshot
 
-# Load environment variables
-load_dotenv()
-EMAILJS_SERVICE_ID = os.getenv("EMAILJS_SERVICE_ID")
-EMAILJS_TEMPLATE_ID = os.getenv("EMAILJS_TEMPLATE_ID")
-EMAILJS_PUBLIC_KEY = os.getenv("EMAILJS_PUBLIC_KEY")
-ALERT_RECIPIENT = os.getenv("ALERT_RECIPIENT_EMAIL", "test@example.com")
+# Heavy libraries (pandas, plotly.express, sklearn via joblib, requests, dotenv)
+# are imported on first use or by the warm-up thread below, so the server can
+# start answering requests before they are loaded.
 
-# Load AI model and label encoder
+# AI model and label encoder (loaded in the background, see warm_up)
 MODEL_FILE = "ai_disaster_model.pkl"
 ENCODER_FILE = "label_encoder.pkl"
 
 if not os.path.exists(MODEL_FILE) or not os.path.exists(ENCODER_FILE):
     raise FileNotFoundError("AI model or label encoder not found. Run train_ai_model.py first.")
 
-ai_model = joblib.load(MODEL_FILE)
-label_encoder = joblib.load(ENCODER_FILE)
+ai_model = None
+label_encoder = None
+warmup_done = threading.Event()
+warmup_error = None
+warmup_lock = threading.Lock()
 
-# Load initial sensor data
-try:
-    data = pd.read_csv("data/sensor_data.csv")
-except FileNotFoundError:
-    data = pd.DataFrame(columns=['temperature', 'humidity', 'pressure', 'disaster_type'])
+def warm_up():
+    global warmup_error
+    with warmup_lock:
+        if warmup_done.is_set():
+            return
+        try:
+            _load_model()
+        except Exception as e:
+            warmup_error = e
+            print("Model warm-up failed:", e)
+        finally:
+            warmup_done.set()
 
-for col in ['temperature', 'humidity', 'pressure', 'disaster_type']:
-    if col not in data.columns:
-        data[col] = pd.Series([0]*len(data))
+def _load_model():
+    global ai_model, label_encoder
+    import joblib
+    ai_model = joblib.load(MODEL_FILE)
+    label_encoder = joblib.load(ENCODER_FILE)
+    # Import what the callbacks need so the first tick isn't slow either
+    import pandas, plotly.express, requests, schema  # noqa: F401
+    ai_model.predict([[30.0, 65.0, 1012.0]])
+
+# DASHBOARD_WARMUP: "background" (default) loads the model in a thread while
+# the server starts, "eager" loads it before serving (old behaviour), "lazy"
+# waits for the first prediction.
+WARMUP_MODE = os.environ.get("DASHBOARD_WARMUP", "background")
+if WARMUP_MODE == "eager":
+    warm_up()
+elif WARMUP_MODE != "lazy":
+    threading.Thread(target=warm_up, daemon=True).start()
+
+# Email alert settings, read from .env on the first alert
+alert_config = None
+
+def load_alert_config():
+    global alert_config
+    if alert_config is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+        alert_config = {
+            'service_id': os.getenv("EMAILJS_SERVICE_ID"),
+            'template_id': os.getenv("EMAILJS_TEMPLATE_ID"),
+            'public_key': os.getenv("EMAILJS_PUBLIC_KEY"),
+            'recipient': os.getenv("ALERT_RECIPIENT_EMAIL", "test@example.com"),
+            'url': os.getenv("EMAILJS_API_URL", "https://api.emailjs.com/api/v1.0/email/send"),
+        }
+    return alert_config
+
+# Initial sensor data: compact JSON snapshot of data/sensor_data.csv
+LIVE_COLUMNS = snapshot.SENSOR_COLUMNS + ['severity']
+SNAPSHOT_FILE = os.environ.get("DASHBOARD_SNAPSHOT", snapshot.SNAPSHOT_FILE)
+initial_records = snapshot.load_initial_records(snapshot_file=SNAPSHOT_FILE)
+data = None  # typed DataFrame, built from initial_records on the first tick
+
+# Streaming pre-filter: steady readings close to the last scored one skip the model
+prefilter = AnomalyFilter()
 
 # Initialize Dash
 app = Dash(__name__)
 server = app.server
 
+# Readiness probe: 503 until the model has been loaded (always ready in lazy mode)
+@server.route('/ready')
+def ready():
+    if not warmup_done.is_set():
+        if WARMUP_MODE == "lazy":
+            return {'ready': True, 'model_loaded': False}, 200
+        return {'ready': False}, 503
+    if warmup_error is not None:
+        return {'ready': False, 'error': str(warmup_error)}, 503
+    return {'ready': True}, 200
+
 app.layout = html.Div([
     html.H1("DisasterSense Live IoT Dashboard", style={'textAlign': 'center', 'color': 'darkblue'}),
-    dcc.Store(id='store-live-data', data=data.to_dict('records')),
+    dcc.Store(id='store-live-data', data=initial_records),
     html.Div(id='cards-dashboard', style={'display': 'flex', 'justifyContent': 'space-around', 'marginBottom': '20px'}),
     html.Div([
         html.Div([
@@ -87,6 +142,11 @@ def generate_new_sensor_data():
 
 # Predict severity
 def predict_severity(sensor_row):
+    if WARMUP_MODE == "lazy":
+        warm_up()
+    warmup_done.wait()
+    if ai_model is None:
+        raise RuntimeError(f"AI model not loaded: {warmup_error}")
     features = [[sensor_row['temperature'], sensor_row['humidity'], sensor_row['pressure']]]
     pred_encoded = ai_model.predict(features)[0]
     severity = label_encoder.inverse_transform([pred_encoded])[0]
@@ -97,41 +157,71 @@ def send_email_alert(sensor_row):
     severity = sensor_row.get('severity', 'Safe')
     if severity == 'Safe':
         return
-    if not EMAILJS_SERVICE_ID or not EMAILJS_TEMPLATE_ID or not EMAILJS_PUBLIC_KEY:
+    config = load_alert_config()
+    if not config['service_id'] or not config['template_id'] or not config['public_key']:
         print("EmailJS environment variables not set")
         return
     try:
+        import requests
         payload = {
-            "service_id": EMAILJS_SERVICE_ID,
-            "template_id": EMAILJS_TEMPLATE_ID,
-            "user_id": EMAILJS_PUBLIC_KEY,
+            "service_id": config['service_id'],
+            "template_id": config['template_id'],
+            "user_id": config['public_key'],
             "template_params": {
                 "disaster_type": sensor_row['disaster_type'],
                 "temperature": sensor_row['temperature'],
                 "humidity": sensor_row['humidity'],
                 "pressure": sensor_row['pressure'],
                 "severity": sensor_row['severity'],
-                "to_email": ALERT_RECIPIENT
+                "to_email": config['recipient']
             }
         }
-        requests.post("https://api.emailjs.com/api/v1.0/email/send", json=payload)
+        requests.post(config['url'], json=payload)
     except Exception as e:
         print("Email alert failed:", e)
 
+# Pre-filter and score one reading; returns True if it should raise an alert:
+# a non-Safe severity on a warm-up, change-point or fault reading, or a
+# severity that differs from the sensor's previous one
+def score_reading(new_row, sensor_id='default'):
+    label = prefilter.check(new_row, sensor_id)
+    # NaN != NaN, so this also catches empty CSV fields
+    if any(new_row.get(col) is None or new_row[col] != new_row[col] for col in prefilter.columns):
+        print("Sensor reading incomplete, skipping inference:", new_row)
+        new_row['severity'] = None
+        return False
+    severity = None if prefilter.should_route(label) else prefilter.cached_severity(new_row, sensor_id)
+    if severity is None:
+        severity = predict_severity(new_row)
+        prefilter.remember(new_row, severity, sensor_id, reuse=label != FAULT)
+    new_row['severity'] = severity
+    changed = prefilter.severity_changed(severity, sensor_id)
+    return severity != 'Safe' and (prefilter.should_route(label) or changed)
+
+# Append a scored reading to the live window and return the store records
+def append_reading(new_row):
+    global data
+    import pandas as pd
+    import schema
+    if data is None:
+        data = schema.apply_schema(pd.DataFrame(initial_records, columns=LIVE_COLUMNS))
+    data = pd.concat([data, schema.apply_schema(pd.DataFrame([new_row]))], ignore_index=True)
+    if len(data) > 500:
+        data = data.iloc[-500:]
+    return schema.to_float64(data).to_dict('records')
+
 # Update live data
 @app.callback(
     Output('store-live-data', 'data'),
     Input('interval-update', 'n_intervals')
 )
 def update_live_data(n):
-    global data
     new_row = generate_new_sensor_data()
-    new_row['severity'] = predict_severity(new_row)
-    data = pd.concat([data, pd.DataFrame([new_row])], ignore_index=True)
-    if len(data) > 500:
-        data = data.iloc[-500:]
-    threading.Thread(target=send_email_alert, args=(new_row,), daemon=True).start()
-    return data.to_dict('records')
+    alert = score_reading(new_row)
+    records = append_reading(new_row)
+    if alert:
+        threading.Thread(target=send_email_alert, args=(new_row,), daemon=True).start()
+    return records
 
 # Dashboard cards
 @app.callback(
@@ -140,7 +230,9 @@ def update_live_data(n):
     Input('dropdown-disaster-type', 'value')
 )
 def update_cards(records, disaster_type):
-    df = pd.DataFrame(records)
+    import pandas as pd
+    import schema
+    df = schema.apply_schema(pd.DataFrame(records))
     if df.empty:
         return []
 
@@ -151,6 +243,7 @@ def update_cards(records, disaster_type):
     total_disasters = len(df)
     counts = df['disaster_type'].value_counts().to_dict()
     severity_counts = df['severity'].value_counts().to_dict()
+    filter_stats = prefilter.stats()
 
     return [
         html.Div([
@@ -159,8 +252,12 @@ def update_cards(records, disaster_type):
         ], style={'border': '2px solid black', 'padding': '10px', 'width': '20%', 'borderRadius': '10px'}),
         html.Div([
             html.H3("Latest Reading", style={'textAlign': 'center'}),
-            html.P(f"{latest['temperature']}°C / {latest['humidity']}% | Severity: {latest['severity']}",
-                   style={'fontSize': '18px', 'textAlign': 'center', 'color': 'darkgreen'})
+            html.P(f"{latest['temperature']:.1f}°C / {latest['humidity']:.1f}% | "
+                   f"Severity: {latest['severity'] if pd.notna(latest['severity']) else 'n/a (missing reading)'}",
+                   style={'fontSize': '18px', 'textAlign': 'center', 'color': 'darkgreen'}),
+            html.P(f"Model calls skipped: {filter_stats['short_circuit_ratio']:.0%} "
+                   f"(reused {filter_stats['reused']}) | faults {filter_stats['fault']} | changes {filter_stats['change']}",
+                   style={'fontSize': '14px', 'textAlign': 'center', 'color': 'gray'})
         ], style={'border': '2px solid black', 'padding': '10px', 'width': '30%', 'borderRadius': '10px'}),
         html.Div([
             html.H3("Disaster Counts", style={'textAlign': 'center'}),
@@ -178,13 +275,17 @@ def update_cards(records, disaster_type):
     Input('dropdown-disaster-type', 'value')
 )
 def update_line_graph(records, disaster_type):
-    df = pd.DataFrame(records)
+    import pandas as pd
+    import plotly.express as px
+    import schema
+    df = schema.apply_schema(pd.DataFrame(records))
     if df.empty:
         return px.line()
 
     if disaster_type != 'All':
         df = df[df['disaster_type'] == disaster_type]
 
+    df = schema.to_float64(df)
     fig = px.line(df, y=['temperature','humidity','pressure'], title="Temperature, Humidity & Pressure Over Time")
     return fig
 
@@ -195,14 +296,18 @@ def update_line_graph(records, disaster_type):
     Input('dropdown-disaster-type', 'value')
 )
 def update_bar_graph(records, disaster_type):
-    df = pd.DataFrame(records)
+    import pandas as pd
+    import plotly.express as px
+    import schema
+    df = schema.apply_schema(pd.DataFrame(records))
     if df.empty:
         return px.bar()
 
     if disaster_type != 'All':
         df = df[df['disaster_type'] == disaster_type]
 
-    counts = df['disaster_type'].value_counts().reset_index()
+    counts = df['disaster_type'].value_counts()
+    counts = counts[counts > 0].reset_index()
     counts.columns = ['disaster_type','count']
     fig = px.bar(counts, x='disaster_type', y='count', color='disaster_type', text='count', title="Disaster Counts")
     return fig
@@ -214,7 +319,10 @@ def update_bar_graph(records, disaster_type):
     Input('dropdown-disaster-type', 'value')
 )
 def update_map(records, disaster_type):
-    df = pd.DataFrame(records)
+    import pandas as pd
+    import plotly.express as px
+    import schema
+    df = schema.apply_schema(pd.DataFrame(records))
     if df.empty:
         return px.scatter_geo()
 
@@ -224,8 +332,10 @@ def update_map(records, disaster_type):
     df['lat'] = [12.9 + random.uniform(-0.1,0.1) for _ in range(len(df))]
     df['lon'] = [77.6 + random.uniform(-0.1,0.1) for _ in range(len(df))]
 
+    df = schema.to_float64(df)
+    # Marker size must be a non-negative number; faulty readings get the smallest marker
     fig = px.scatter_geo(df, lat='lat', lon='lon', color='disaster_type',
-                         size=df['temperature'], title="Disaster Locations", projection="natural earth")
+                         size=df['temperature'].fillna(0).clip(lower=0), title="Disaster Locations", projection="natural earth")
     return fig
 
 # Run server
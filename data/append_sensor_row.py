@@ -21,12 +21,16 @@ row = {
     "longitude": round(random.uniform(-180, 180), 4)
 }
 
-# Append row to CSV
-if os.path.isfile(sensor_file):
-    df = pd.read_csv(sensor_file)
-    df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
+# Append row to CSV (no need to load the whole history just to add one line).
+# Line the row up with the existing header so columns match by name; if the
+# row has a column the file doesn't, rewrite the file with the wider header.
+df = pd.DataFrame([row])
+if os.path.isfile(sensor_file) and os.path.getsize(sensor_file) > 0:
+    header = pd.read_csv(sensor_file, nrows=0).columns
+    if set(row) <= set(header):
+        df.reindex(columns=header).to_csv(sensor_file, mode='a', header=False, index=False)
+    else:
+        pd.concat([pd.read_csv(sensor_file), df], ignore_index=True).to_csv(sensor_file, index=False)
 else:
-    df = pd.DataFrame([row])
-
-df.to_csv(sensor_file, index=False)
+    df.to_csv(sensor_file, index=False)
 print(f"✅ Added 1 new row to {sensor_file}")
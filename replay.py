@@ -0,0 +1,276 @@
+# replay.py
+# Time-accelerated replay of recorded sensor logs through the full pipeline:
+#
+#   ingest    -> typed chunked read of the log (or generated fixtures)
+#   predict   -> dashboard.score_reading (pre-filter + severity model)
+#   alert     -> dashboard.send_email_alert, posted to a local stub endpoint
+#   dashboard -> dashboard.append_reading + the card/graph callbacks
+#
+# Rows are paced by the gap to the latest timestamp so far in their file, at
+# --speed x real time (0 = as fast as possible). Out-of-order rows are due
+# immediately, and each input file starts when the previous one ends. Each
+# stage runs in turn for every row so its latency and memory peak can be
+# measured on its own; end-to-end latency is measured from the time a row was
+# due, so queueing behind a saturated stage shows up there. A stage that
+# raises is counted as an error for that row and the replay carries on, so
+# faulty log rows can be replayed too.
+#
+# Usage (from the repo root):
+#   python replay.py data/prediction_log.csv --speed 100
+#   python replay.py data/real_sensor_data.csv data/prediction_log.csv --speed 0
+#   python replay.py --generate 5000 --speed 0 --render-every 10 --memory
+import argparse
+import os
+import random
+import resource
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STAGES = ['ingest', 'predict', 'alert', 'dashboard']
+DEFAULT_TICK = 5.0  # seconds between rows without timestamps (dashboard interval)
+
+
+class StubAlertHandler(BaseHTTPRequestHandler):
+    """Accepts EmailJS-style POSTs and counts them instead of sending mail."""
+    received = 0
+    latency = 0.0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            StubAlertHandler.received += 1
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"OK")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency=0.0):
+    StubAlertHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAlertHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def generate_rows(count, seed=42):
+    """Fixture rows shaped like generate_sample_data.py, two minutes apart."""
+    rng = random.Random(seed)
+    start = datetime(2025, 9, 15)
+    for i in range(count):
+        yield {
+            'temperature': round(rng.uniform(20, 40), 1),
+            'humidity': round(rng.uniform(40, 90), 1),
+            'pressure': round(rng.uniform(1005, 1020), 1),
+            'disaster_type': rng.choice(['flood', 'landslide', 'wildfire']),
+            'timestamp': start + timedelta(minutes=2 * i),
+        }
+
+
+def read_rows(paths, chunksize):
+    """Stream rows from history CSVs as dicts the dashboard understands."""
+    import pandas as pd
+    import schema
+
+    for path in paths:
+        for chunk in schema.read_csv(path, chunksize=chunksize):
+            chunk['_source'] = path
+            if 'disaster_type' not in chunk.columns:
+                # Logs only carry the predicted label; use it as the disaster type
+                labels = chunk.get('predicted_disaster', pd.Series(index=chunk.index, dtype=object))
+                chunk['disaster_type'] = pd.Categorical(labels.astype(object), dtype=schema.DISASTER_TYPE_DTYPE)
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            yield from chunk.to_dict('records')
+
+
+class StageStats:
+    def __init__(self):
+        self.latencies = []
+        self.busy = 0.0
+        self.mem_peak = 0
+        self.errors = 0
+        self.last_error = None
+
+    def add(self, seconds, mem_peak=0):
+        self.latencies.append(seconds)
+        self.busy += seconds
+        self.mem_peak = max(self.mem_peak, mem_peak)
+
+
+class Replay:
+    def __init__(self, dashboard, trace_memory=False, render_every=1):
+        self.dashboard = dashboard
+        self.trace_memory = trace_memory
+        self.render_every = max(1, render_every)
+        self.stages = {name: StageStats() for name in STAGES}
+        self.e2e = []
+        self.alerts = 0
+        self.started = None
+
+    def timed(self, stage, fn, *args):
+        """Run one stage; returns (ok, result) and counts exceptions instead of raising."""
+        stats = self.stages[stage]
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        try:
+            result, ok = fn(*args), True
+        except Exception as e:
+            result, ok = None, False
+            stats.errors += 1
+            stats.last_error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] - base if self.trace_memory else 0
+        stats.add(elapsed, peak)
+        return ok, result
+
+    def render(self, records):
+        d = self.dashboard
+        d.update_cards(records, 'All')
+        d.update_line_graph(records, 'All')
+        d.update_bar_graph(records, 'All')
+        d.update_map(records, 'All')
+
+    def dashboard_path(self, row, render):
+        records = self.dashboard.append_reading(row)
+        if render:
+            self.render(records)
+
+    def run(self, rows, speed, limit=0):
+        if self.trace_memory:
+            tracemalloc.start()
+        rows = iter(rows)
+        self.started = time.perf_counter()
+        source = object()
+        prev_ts = due = None
+        n = 0
+        try:
+            while not limit or n < limit:
+                t_read = time.perf_counter()
+                ok, row = self.timed('ingest', next, rows, None)
+                if not ok or row is None:
+                    # A broken reader can't be resumed; report what we have
+                    break
+
+                # When is this row due? The first row of each file is due now,
+                # later ones after the (non-negative) gap to the latest earlier row.
+                ts = row.pop('timestamp', None)
+                row_source = row.pop('_source', None)
+                if speed <= 0:
+                    due = t_read
+                elif row_source != source:
+                    due = time.perf_counter()
+                    prev_ts = None
+                else:
+                    if ts is not None and prev_ts is not None:
+                        gap = max(0.0, (ts - prev_ts).total_seconds())
+                    else:
+                        gap = DEFAULT_TICK
+                    due += gap / speed
+                    wait = due - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+                source = row_source
+                if ts is not None:
+                    # Only move forward: after an out-of-order row, the next one
+                    # is paced from the latest timestamp seen so far
+                    prev_ts = ts if prev_ts is None else max(prev_ts, ts)
+
+                ok, alert = self.timed('predict', self.dashboard.score_reading, row)
+                if ok and alert:
+                    sent, _ = self.timed('alert', self.dashboard.send_email_alert, row)
+                    self.alerts += sent
+                self.timed('dashboard', self.dashboard_path, row, n % self.render_every == 0)
+                self.e2e.append(time.perf_counter() - due)
+                n += 1
+        finally:
+            if self.trace_memory:
+                tracemalloc.stop()
+        return n, time.perf_counter() - self.started
+
+
+def percentiles(values):
+    import numpy as np
+    if not values:
+        return [float('nan')] * 4
+    return [*np.percentile(values, [50, 95, 99]) * 1000, max(values) * 1000]
+
+
+def report(replay, rows, elapsed, stub_received, trace_memory):
+    print(f"\n📊 Replayed {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.1f} rows/s)")
+    print(f"{'stage':<10} {'calls':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} "
+          f"{'max rows/s':>11} {'mem peak KiB':>13} {'errors':>7}")
+    for name in STAGES:
+        stats = replay.stages[name]
+        p50, p95, p99, worst = percentiles(stats.latencies)
+        capacity = len(stats.latencies) / stats.busy if stats.busy else float('inf')
+        mem = f"{stats.mem_peak / 1024:13.1f}" if trace_memory else f"{'n/a':>13}"
+        print(f"{name:<10} {len(stats.latencies):>7} {p50:9.2f} {p95:9.2f} {p99:9.2f} {worst:9.2f} "
+              f"{capacity:11,.1f} {mem} {stats.errors:>7}")
+    p50, p95, p99, worst = percentiles(replay.e2e)
+    print(f"{'end-to-end':<10} {len(replay.e2e):>7} {p50:9.2f} {p95:9.2f} {p99:9.2f} {worst:9.2f}")
+    for name in STAGES:
+        if replay.stages[name].errors:
+            print(f"⚠️  {name}: {replay.stages[name].errors} errors, last: {replay.stages[name].last_error}")
+
+    filter_stats = replay.dashboard.prefilter.stats()
+    print(f"Pre-filter: {filter_stats['routed']} model calls, {filter_stats['short_circuited']} short-circuited "
+          f"({filter_stats['short_circuit_ratio']:.0%}), {filter_stats['change']} changes, {filter_stats['fault']} faults")
+    print(f"Alerts: {replay.alerts} sent, {stub_received} received by stub")
+    # ru_maxrss is KiB on Linux
+    print(f"Process RSS high-water mark: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+    if trace_memory:
+        print("(latencies include tracemalloc overhead; run without --memory for clean timings)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded sensor logs through the full pipeline")
+    parser.add_argument("files", nargs="*", help="History CSVs (e.g. data/prediction_log.csv)")
+    parser.add_argument("--generate", "-g", type=int, default=0, help="Replay N generated rows instead of files")
+    parser.add_argument("--speed", "-s", type=float, default=0.0, help="x real time (default 0 = as fast as possible)")
+    parser.add_argument("--limit", "-n", type=int, default=0, help="Stop after N rows (0 = all)")
+    parser.add_argument("--render-every", type=int, default=1,
+                        help="Run the card/graph callbacks every N rows (default 1, like one tick per row)")
+    parser.add_argument("--chunksize", type=int, default=10_000, help="Rows per CSV read (default 10000)")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Seconds the stub alert endpoint waits")
+    parser.add_argument("--memory", action="store_true",
+                        help="Record per-stage memory peaks with tracemalloc (much slower)")
+    args = parser.parse_args()
+
+    if not args.files and not args.generate:
+        parser.error("give history files or --generate N")
+
+    # Point alerts at the stub before the dashboard reads its config
+    stub = start_stub_server(args.stub_latency)
+    os.environ["EMAILJS_API_URL"] = f"http://127.0.0.1:{stub.server_address[1]}/send"
+    for key in ("EMAILJS_SERVICE_ID", "EMAILJS_TEMPLATE_ID", "EMAILJS_PUBLIC_KEY"):
+        os.environ[key] = "replay"
+    os.environ["ALERT_RECIPIENT_EMAIL"] = "replay@example.com"
+    os.environ["DASHBOARD_WARMUP"] = "eager"
+
+    import dashboard
+
+    rows = generate_rows(args.generate) if args.generate else read_rows(args.files, args.chunksize)
+    print(f"▶️  Replaying {'generated rows' if args.generate else ', '.join(args.files)} at "
+          f"{'max speed' if args.speed <= 0 else f'{args.speed:g}x real time'}")
+    replay = Replay(dashboard, trace_memory=args.memory, render_every=args.render_every)
+    try:
+        count, elapsed = replay.run(rows, args.speed, args.limit)
+    except KeyboardInterrupt:
+        print("\n🛑 Replay interrupted.")
+        count = len(replay.e2e)
+        elapsed = time.perf_counter() - replay.started if replay.started else 0.0
+    stub.shutdown()
+    report(replay, count, elapsed, StubAlertHandler.received, args.memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# schema.py
+# Central dtype declarations for every sensor / prediction frame in DisasterSense.
+#
+# Readings are stored as float32 (sensor precision is 0.1), coordinates stay
+# float64, labels are categoricals with a fixed category set and timestamps
+# are datetime64. Use read_csv() for files and apply_schema() for in-memory
+# buffers (e.g. the dashboard store) so both paths end up with the same dtypes.
+import numpy as np
+import pandas as pd
+
+READING_COLUMNS = ['temperature', 'humidity', 'pressure']
+COORD_COLUMNS = ['latitude', 'longitude']
+
+DISASTER_TYPES = ['flood', 'landslide', 'wildfire']
+PREDICTED_DISASTERS = DISASTER_TYPES + ['heatwave', 'no disaster']
+SEVERITY_LEVELS = ['Safe', 'Warning', 'Critical']
+
+DISASTER_TYPE_DTYPE = pd.CategoricalDtype(DISASTER_TYPES)
+PREDICTED_DISASTER_DTYPE = pd.CategoricalDtype(PREDICTED_DISASTERS)
+SEVERITY_DTYPE = pd.CategoricalDtype(SEVERITY_LEVELS, ordered=True)
+
+READING_DTYPE = np.float32
+COORD_DTYPE = np.float64
+
+# Column -> dtype for every known column (timestamp is parsed separately)
+DTYPES = {
+    **{col: READING_DTYPE for col in READING_COLUMNS},
+    **{col: COORD_DTYPE for col in COORD_COLUMNS},
+    'disaster_type': DISASTER_TYPE_DTYPE,
+    'predicted_disaster': PREDICTED_DISASTER_DTYPE,
+    'severity': SEVERITY_DTYPE,
+}
+TIMESTAMP_COLUMN = 'timestamp'
+KNOWN_COLUMNS = list(DTYPES) + [TIMESTAMP_COLUMN]
+
+# Spellings found in older CSVs (generate_real_csv.py writes "None"/"Flood")
+LABEL_ALIASES = {'none': 'no disaster', '': None}
+
+# pandas' default missing-value tokens, used for every non-label column.
+# Label columns only treat an empty field as missing, since "None" is a label.
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+             '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+LABEL_NA_VALUES = ['']
+
+
+def _to_category(series, dtype):
+    """Cast a label column to a fixed categorical, normalising case/aliases.
+
+    Works on the (few) distinct labels rather than every row, so it stays
+    cheap on large frames. Unknown labels become NaN.
+    """
+    series = series.astype('category')
+    if dtype.ordered:
+        # Severity labels are already canonical ("Safe", "Warning", "Critical")
+        return series.astype(dtype)
+
+    names = [str(c).strip().lower() for c in series.cat.categories]
+    names = [LABEL_ALIASES.get(n, n) for n in names]
+    lookup = np.append(dtype.categories.get_indexer(names), -1)
+    codes = lookup[series.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=series.index, name=series.name)
+
+
+def parse_timestamps(series):
+    # Log files mix "2025-09-16 07:44:15" and "2025-09-15 21:54:50.033184"
+    return pd.to_datetime(series, format='ISO8601', errors='coerce')
+
+
+def apply_schema(df):
+    """Return df with the project dtypes applied to every known column it has."""
+    df = df.copy()
+    for col, dtype in DTYPES.items():
+        if col not in df.columns:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = _to_category(df[col], dtype)
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+    if TIMESTAMP_COLUMN in df.columns and not pd.api.types.is_datetime64_any_dtype(df[TIMESTAMP_COLUMN]):
+        df[TIMESTAMP_COLUMN] = parse_timestamps(df[TIMESTAMP_COLUMN])
+    return df
+
+
+def to_float64(df):
+    """Copy of df with float32 columns widened to float64 for JSON/plotting.
+
+    Going through str keeps the printed value, so float32 23.3 comes out as
+    23.3 rather than 23.299999237060547.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == np.float32:
+            df[col] = df[col].astype(str).astype('float64')
+    return df
+
+
+def empty_frame(columns):
+    """Empty DataFrame with the given columns already typed."""
+    return apply_schema(pd.DataFrame(columns=columns))
+
+
+def read_csv(path, columns=None, chunksize=None, **kwargs):
+    """Read a sensor/prediction CSV with the project dtypes.
+
+    Only known columns (or the requested subset) are parsed. Labels are read
+    as plain categoricals and then mapped onto the fixed category sets, so
+    odd spellings in old files don't turn into NaN. With chunksize, returns
+    an iterator of typed chunks instead of a single frame. Extra keyword
+    arguments (e.g. skiprows) are passed through to pd.read_csv.
+    """
+    wanted = set(columns or KNOWN_COLUMNS)
+    dtype = {
+        col: ('category' if isinstance(dt, pd.CategoricalDtype) else dt)
+        for col, dt in DTYPES.items() if col in wanted
+    }
+    na_values = {
+        col: (LABEL_NA_VALUES if isinstance(DTYPES.get(col), pd.CategoricalDtype) else NA_VALUES)
+        for col in KNOWN_COLUMNS if col in wanted
+    }
+    reader = pd.read_csv(path, usecols=lambda c: c in wanted, dtype=dtype, chunksize=chunksize,
+                         keep_default_na=False, na_values=na_values, **kwargs)
+    if chunksize is None:
+        return apply_schema(reader)
+    return (apply_schema(chunk) for chunk in reader)
@@ -0,0 +1,118 @@
+# snapshot.py
+# Compact JSON snapshot of the dashboard's initial store.
+#
+# Parsing data/sensor_data.csv needs pandas, which is one of the slowest
+# imports at dashboard start-up. The snapshot holds the same records as
+# plain JSON (columns + rows) so the layout can be built with the standard
+# library only. It remembers the size, mtime and SHA-1 of the CSV it came
+# from and is rebuilt automatically when the CSV changes. The snapshot is
+# checked in, so a fresh checkout starts without pandas; mtimes differ after
+# a checkout, in which case the (stdlib-only) content hash decides.
+#
+# Usage (from the repo root, after changing data/sensor_data.csv):
+#   python snapshot.py
+import hashlib
+import json
+import os
+import tempfile
+
+SENSOR_FILE = "data/sensor_data.csv"
+SNAPSHOT_FILE = "data/sensor_snapshot.json"
+SENSOR_COLUMNS = ['temperature', 'humidity', 'pressure', 'disaster_type']
+MAX_ROWS = 500
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_info(csv_file):
+    st = os.stat(csv_file)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': _file_digest(csv_file)}
+
+
+def _is_fresh(source, csv_file):
+    if not source:
+        return False
+    st = os.stat(csv_file)
+    if st.st_size != source.get('size'):
+        return False
+    if st.st_mtime_ns == source.get('mtime_ns'):
+        return True
+    # mtime changes on checkout/copy; compare contents instead
+    return _file_digest(csv_file) == source.get('sha1')
+
+
+def build_records(csv_file=SENSOR_FILE, max_rows=MAX_ROWS):
+    """Parse the CSV with pandas and return the last max_rows store records."""
+    import pandas as pd
+    import schema
+
+    try:
+        df = schema.read_csv(csv_file, columns=SENSOR_COLUMNS)
+    except FileNotFoundError:
+        df = schema.empty_frame(SENSOR_COLUMNS)
+    for col in SENSOR_COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.Series([0]*len(df))
+    df = df[SENSOR_COLUMNS].iloc[-max_rows:]
+    df = schema.to_float64(df)
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
+
+
+def write_snapshot(csv_file=SENSOR_FILE, snapshot_file=SNAPSHOT_FILE, records=None):
+    if records is None:
+        records = build_records(csv_file)
+    payload = {
+        'source': _source_info(csv_file) if os.path.exists(csv_file) else None,
+        'columns': SENSOR_COLUMNS,
+        'rows': [[r[col] for col in SENSOR_COLUMNS] for r in records],
+    }
+    # Unique temp file per process: workers starting together may all rebuild
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(snapshot_file) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, snapshot_file)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return records
+
+
+def read_snapshot(snapshot_file=SNAPSHOT_FILE, csv_file=SENSOR_FILE):
+    """Return the snapshot records, or None if missing or older than the CSV."""
+    try:
+        with open(snapshot_file) as f:
+            payload = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if os.path.exists(csv_file) and not _is_fresh(payload.get('source'), csv_file):
+        return None
+    columns = payload['columns']
+    return [dict(zip(columns, row)) for row in payload['rows']]
+
+
+def load_initial_records(csv_file=SENSOR_FILE, snapshot_file=SNAPSHOT_FILE):
+    """Snapshot records if fresh, otherwise rebuild from the CSV (and save the snapshot)."""
+    records = read_snapshot(snapshot_file, csv_file)
+    if records is not None:
+        return records
+    records = build_records(csv_file)
+    try:
+        write_snapshot(csv_file, snapshot_file, records)
+    except OSError as e:
+        print("Could not write sensor snapshot:", e)
+    return records
+
+
+if __name__ == "__main__":
+    rows = write_snapshot()
+    print(f"✅ {len(rows)} rows from {SENSOR_FILE} saved to {SNAPSHOT_FILE}")
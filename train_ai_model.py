@@ -4,6 +4,7 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
 import joblib
 import os
+import schema
 
 # File paths
 DATA_FILE = "data/sensor_data.csv"
@@ -13,7 +14,7 @@ MODEL_FILE = "ai_disaster_model.pkl"
 if not os.path.exists(DATA_FILE):
     raise FileNotFoundError(f"{DATA_FILE} not found. Please generate sensor_data.csv first.")
 
-data = pd.read_csv(DATA_FILE)
+data = schema.read_csv(DATA_FILE)
 
 # Fill missing columns if any
 for col in ['temperature', 'humidity', 'pressure', 'disaster_type']:
@@ -7,12 +7,13 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.metrics import accuracy_score, classification_report
 import pickle
 import os
+import schema
 
 # -------------------------
 # Step 1: Load Sensor Data
 # -------------------------
 try:
-    data = pd.read_csv("data/sensor_data.csv")
+    data = schema.read_csv("data/sensor_data.csv")
     print("✅ CSV loaded successfully with delimiter ','")
 except Exception as e:
     print("❌ Failed to load CSV:", e)